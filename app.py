@@ -1,10 +1,12 @@
 #test2
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
+import bcrypt
+import re
+from gs_utils import (get_gsheet_data, load_configs, clear_configs, index_by_product, column_options,
+                      read_local_data, append_local_data, save_locally, sync_local_data_to_sheet)
 
 # ------------------ SETTINGS ------------------
 APP_TITLE = "Die Casting Production"
@@ -13,18 +15,69 @@ PRODUCTION_CONFIG_SHEET = "Production_Config"
 QUALITY_CONFIG_SHEET = "Quality_Config"
 DOWNTIME_CONFIG_SHEET = "Downtime_Config"
 TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
-SRI_LANKA_TZ = pytz.timezone('Asia/Colombo')
+DISPLAY_TIME_FORMAT = "%Y-%m-%d %H:%M"
+SRI_LANKA_TZ = ZoneInfo('Asia/Colombo')
 
 # ------------------ USER CREDENTIALS ------------------
+# bcrypt hashes; generate new ones with bcrypt.hashpw(b"password", bcrypt.gensalt())
 USER_CREDENTIALS = {
-    "Team Leader A ": "Team@A",
-    "Team Leader B ": "Team@B",
-    "Team Leader C ": "Team@C",
-    "Supervisor":"Team@123"
+    "Team Leader A ": b"$2b$12$LbC6AosIz90v7fudtIV/E.LU00zMAKXsMRKYawnkEkTGequeSAjZK",
+    "Team Leader B ": b"$2b$12$KPw4l06M2k1NzFAqlxiaEO0iQmdZbm8TCnM2kxIs/SYSkpcgX.4uy",
+    "Team Leader C ": b"$2b$12$fbeIFBpUTkRTv5K/aLYjlea9vYRYX6HpXIl3F6Z6ujIlXooOZISRq",
+    "Supervisor": b"$2b$12$OlOARWzuVxIMHhsBjNAzUOZ8j9TjqwfE3cavt.GTZWQaM/k0z8Mji"
 }
 
-QUALITY_SHARED_PASSWORD = "12"
-DOWNTIME_SHARED_PASSWORD = "DownT@123"
+QUALITY_SHARED_PASSWORD = b"$2b$12$WwX5yuX6UwJDp55q3jsHtuzIKQyillZOlEyKYLLmF1YOx6g7USyBK"
+DOWNTIME_SHARED_PASSWORD = b"$2b$12$U2kiLIVKrylXco2HoisQGOX5h20bXsykvwQQcxMqF5nS1Ee3VEuzy"
+
+# Hash of a random secret, checked for unknown users so they take as long to
+# reject as a wrong password
+_UNKNOWN_USER_HASH = b"$2b$12$xcGhXvLKZ6jEeKWBQm49Dei2WJt4fup2sNXym33vwfy8ZzkMWMF/i"
+
+def check_password(entered_password, password_hash):
+    # bcrypt only uses 72 bytes (newer releases raise on longer input), so a
+    # longer entry can't be a valid password; still run a check so it takes
+    # as long to reject as any other wrong password
+    password = entered_password.encode()
+    if password_hash is None or len(password) > 72:
+        bcrypt.checkpw(password[:72], _UNKNOWN_USER_HASH)
+        return False
+    return bcrypt.checkpw(password, password_hash)
+
+_BCRYPT_HASH_RE = re.compile(rb"\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}")
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def _read_user_hashes():
+    # Returns (valid hashes, users whose hash is malformed); None when secrets
+    # have no [user_hashes] table. Re-read every 5 minutes so edits to secrets
+    # are picked up without a restart
+    try:
+        if "user_hashes" not in st.secrets:
+            return None
+    except FileNotFoundError:
+        return None
+    hashes, invalid = {}, []
+    for user, h in st.secrets["user_hashes"].items():
+        h = str(h).strip().encode()
+        if _BCRYPT_HASH_RE.fullmatch(h):
+            hashes[user] = h
+        else:
+            invalid.append(user)
+    return hashes, invalid
+
+def load_user_hashes():
+    # A [user_hashes] table in secrets replaces the built-in accounts, so
+    # passwords can be rotated without a code change. Fail closed: an invalid
+    # table must not bring back the built-in logins
+    loaded = _read_user_hashes()
+    if loaded is None:
+        return USER_CREDENTIALS
+    hashes, invalid = loaded
+    if invalid:
+        st.error(f"Invalid password hash in secrets for: {', '.join(invalid)}")
+    if not hashes:
+        st.error("No valid user in secrets [user_hashes]; production logins are disabled")
+    return hashes
 
 # ------------------ STREAMLIT PAGE CONFIG ------------------
 st.set_page_config(page_title=APP_TITLE, layout="centered")
@@ -32,139 +85,86 @@ st.title(APP_TITLE)
 
 # ------------------ SESSION STATE INIT ------------------
 for var in ["prod_logged_in", "qual_logged_in", "downtime_logged_in",
-            "logged_user", "qual_logged_user", "downtime_logged_user",
-            "prod_local_data", "qual_local_data", "downtime_local_data"]:
+            "logged_user", "qual_logged_user", "downtime_logged_user"]:
     if var not in st.session_state:
-        st.session_state[var] = False if "logged" in var else []
-
-# ------------------ GOOGLE SHEET CONNECTION ------------------
-def get_gs_client():
-    try:
-        if 'gcp_service_account' not in st.secrets:
-            st.error("Google Service Account credentials not found in secrets.")
-            return None
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds_dict = {
-            "type": st.secrets["gcp_service_account"]["type"],
-            "project_id": st.secrets["gcp_service_account"]["project_id"],
-            "private_key_id": st.secrets["gcp_service_account"]["private_key_id"],
-            "private_key": st.secrets["gcp_service_account"]["private_key"].replace('\\n', '\n'),
-            "client_email": st.secrets["gcp_service_account"]["client_email"],
-            "client_id": st.secrets["gcp_service_account"]["client_id"],
-            "auth_uri": st.secrets["gcp_service_account"]["auth_uri"],
-            "token_uri": st.secrets["gcp_service_account"]["token_uri"],
-            "auth_provider_x509_cert_url": st.secrets["gcp_service_account"]["auth_provider_x509_cert_url"],
-            "client_x509_cert_url": st.secrets["gcp_service_account"]["client_x509_cert_url"]
-        }
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        return gspread.authorize(creds)
-    except Exception as e:
-        st.error(f"Failed to authenticate with Google Sheets: {str(e)}")
-        return None
-
-def get_gsheet_data(sheet_name):
-    client = get_gs_client()
-    if client:
-        return client.open(sheet_name)
-    else:
-        return None
-
-def read_sheet(sheet, worksheet_name):
-    try:
-        worksheet = sheet.worksheet(worksheet_name)
-        data = worksheet.get_all_records()
-        return pd.DataFrame(data)
-    except Exception as e:
-        st.error(f"Error reading worksheet '{worksheet_name}': {str(e)}")
-        return pd.DataFrame()
-
-# ------------------ LOCAL SAVE ------------------
-def save_locally(data, storage_key):
-    if storage_key not in st.session_state:
-        st.session_state[storage_key] = []
-    st.session_state[storage_key].append(data)
-    st.success("Data saved locally!")
-
-# ------------------ SYNC FUNCTION ------------------
-def sync_local_data_to_sheet(local_key, history_sheet_name):
-    if local_key not in st.session_state or len(st.session_state[local_key]) == 0:
-        st.warning("No local data to sync!")
-        return
-    client = get_gs_client()
-    if not client:
-        st.error("Cannot connect to Google Sheets!")
-        return
-
-    try:
-        ws = client.open(SHEET_NAME).worksheet(history_sheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        st.error(f"Worksheet '{history_sheet_name}' not found!")
-        return
-
-    # Get existing headers
-    existing_cols = ws.row_values(1) if ws.row_values(1) else []
-    
-    # Ensure User, Product, DateTime are first
-    mandatory_cols = ["User", "Product", "DateTime"]
-    other_existing_cols = [col for col in existing_cols if col not in mandatory_cols]
-    
-    # Collect new columns from local data
-    new_cols = set()
-    for entry in st.session_state[local_key]:
-        for k in entry.keys():
-            if k not in mandatory_cols and k not in other_existing_cols:
-                new_cols.add(k)
-    new_cols = list(new_cols)
-    
-    # Final column order
-    final_cols = mandatory_cols + other_existing_cols + new_cols
-    
-    # Update header row only if columns changed
-    if final_cols != existing_cols:
-        ws.update('1:1', [final_cols])
-    
-    # Prepare rows to append
-    rows_to_append = []
-    for entry in st.session_state[local_key]:
-        row = [entry.get(col, "") for col in final_cols]
-        rows_to_append.append(row)
-
-    ws.append_rows(rows_to_append, value_input_option="USER_ENTERED")
-    
-    # Clear local storage
-    st.session_state[local_key] = []
-    st.success(f"✅ {len(rows_to_append)} records synced to {history_sheet_name}!")
+        st.session_state[var] = False
 
 # ------------------ UNSYNCED DATA COUNT FUNCTION ------------------
 def get_unsynced_counts():
     counts = {
-        "Production": len(st.session_state.get("prod_local_data", [])),
-        "Quality": len(st.session_state.get("qual_local_data", [])),
-        "Downtime": len(st.session_state.get("downtime_local_data", []))
+        "Production": len(read_local_data("prod_local_data")),
+        "Quality": len(read_local_data("qual_local_data")),
+        "Downtime": len(read_local_data("downtime_local_data"))
     }
     return counts
 
 # ------------------ SYNC ALL FUNCTION ------------------
 def sync_all_data():
+    # Rerun to refresh the counts only when everything synced; a rerun would
+    # wipe the error of a failed sync before it is seen
+    all_synced = True
+
     # Sync production data
-    if st.session_state.get("prod_local_data"):
-        sync_local_data_to_sheet("prod_local_data", "Production_History")
+    if read_local_data("prod_local_data"):
+        all_synced &= sync_local_data_to_sheet(SHEET_NAME, "prod_local_data", "Production_History")
     
     # Sync quality data
-    if st.session_state.get("qual_local_data"):
-        sync_local_data_to_sheet("qual_local_data", "Quality_History")
+    if read_local_data("qual_local_data"):
+        all_synced &= sync_local_data_to_sheet(SHEET_NAME, "qual_local_data", "Quality_History")
     
     # Sync downtime data
-    if st.session_state.get("downtime_local_data"):
-        sync_local_data_to_sheet("downtime_local_data", "Downtime_History")
+    if read_local_data("downtime_local_data"):
+        all_synced &= sync_local_data_to_sheet(SHEET_NAME, "downtime_local_data", "Downtime_History")
     
-    st.rerun()
+    if all_synced:
+        st.rerun()
     
 
 # ------------------ DATA ENTRY FUNCTIONS ------------------
+def batch_data_entry(subtopics_df, logged_user, selected_product, storage_key, key):
+    # One editable table instead of a widget per subtopic; rows are sent to
+    # the server together when the form is submitted
+    column_config = {}
+    for subtopic, is_dropdown, options in zip(subtopics_df["Subtopic"].to_numpy(),
+                                              subtopics_df["_is_dd"].to_numpy(),
+                                              subtopics_df["_opts"].to_numpy()):
+        if is_dropdown:
+            column_config[subtopic] = st.column_config.SelectboxColumn(subtopic, options=options)
+        else:
+            column_config[subtopic] = st.column_config.TextColumn(subtopic)
+    template_df = pd.DataFrame({subtopic: pd.Series([None], dtype="object") for subtopic in column_config})
+
+    with st.form(key=f"{key}_form", clear_on_submit=True):
+        edited_df = st.data_editor(template_df, column_config=column_config, num_rows="dynamic",
+                                   hide_index=True, use_container_width=True, key=key)
+        submitted = st.form_submit_button("Save Rows Locally")
+
+    if submitted:
+        now = datetime.now(SRI_LANKA_TZ).strftime(TIME_FORMAT)
+        records = []
+        for row in edited_df.to_dict("records"):
+            values = {k: "" if pd.isna(v) else v for k, v in row.items()}
+            if not any(str(v).strip() for v in values.values()):
+                continue
+            records.append({"User": logged_user, "Product": selected_product, "DateTime": now, **values})
+        if records:
+            append_local_data(storage_key, records)
+            st.success(f"{len(records)} records saved locally!")
+        else:
+            st.warning("No rows to save!")
+
+def subtopic_inputs(subtopics_df, key_prefix=""):
+    # Shared by the production and quality forms: one widget per config row
+    values = {}
+    for subtopic, is_dropdown, options in zip(subtopics_df["Subtopic"].to_numpy(),
+                                              subtopics_df["_is_dd"].to_numpy(),
+                                              subtopics_df["_opts"].to_numpy()):
+        if is_dropdown:
+            values[subtopic] = st.selectbox(subtopic, options, key=f"{key_prefix}{subtopic}")
+        else:
+            values[subtopic] = st.text_input(subtopic, key=f"{key_prefix}{subtopic}")
+    return values
+
 def production_data_entry(logged_user):
     df = st.session_state.production_config_df
     if df.empty:
@@ -172,27 +172,29 @@ def production_data_entry(logged_user):
         return
 
     st.subheader("Please Enter the Production Data")
-    products = df['Product'].unique().tolist()
+    products = st.session_state.product_list
     selected_product = st.selectbox("Select Product", products)
-    now = datetime.now(SRI_LANKA_TZ).strftime(TIME_FORMAT)
-    st.write(f"📅 Date & Time: {now}")
+    now = datetime.now(SRI_LANKA_TZ)
+    st.write(f"📅 Date & Time: {now.strftime(DISPLAY_TIME_FORMAT)}")
 
-    subtopics_df = df[df['Product'] == selected_product]
-    entry = {"User": logged_user, "Product": selected_product, "DateTime": now}
+    subtopics_df = st.session_state.prod_by_product[selected_product]
+    entry = {"User": logged_user, "Product": selected_product, "DateTime": None}
 
     with st.form(key="prod_entry_form"):
-        for _, row in subtopics_df.iterrows():
-            if str(row["Dropdown or Not"]).strip().lower() == "yes":
-                options = [opt.strip() for opt in str(row["Dropdown Options"]).split(",")]
-                entry[row["Subtopic"]] = st.selectbox(row["Subtopic"], options, key=row["Subtopic"])
-            else:
-                entry[row["Subtopic"]] = st.text_input(row["Subtopic"], key=row["Subtopic"])
+        entry.update(subtopic_inputs(subtopics_df, key_prefix=""))
 
         submitted = st.form_submit_button("Save Locally")
         sync_button = st.form_submit_button("💾 Sync Production Data")
 
     if submitted:
+        # Timestamp the record when it is saved, not on every rerun
+        entry["DateTime"] = now.strftime(TIME_FORMAT)
         save_locally(entry, "prod_local_data")
+
+    with st.expander("📋 Enter several records at once"):
+        batch_data_entry(subtopics_df, logged_user, selected_product, "prod_local_data",
+                         key=f"prod_batch_{selected_product}")
+
     if st.button("Logout"):
         st.session_state.prod_logged_in = False
         st.session_state.logged_user = ""
@@ -200,8 +202,8 @@ def production_data_entry(logged_user):
 
     
     if sync_button:
-        sync_local_data_to_sheet("prod_local_data", "Production_History")
-        st.rerun()
+        if sync_local_data_to_sheet(SHEET_NAME, "prod_local_data", "Production_History"):
+            st.rerun()
 
 
 
@@ -212,35 +214,37 @@ def quality_data_entry(logged_user):
         return
 
     st.subheader("Please Enter the Quality Data")
-    products = st.session_state.production_config_df['Product'].unique().tolist()
+    products = st.session_state.product_list
     selected_product = st.selectbox("Select Product", products)
-    now = datetime.now(SRI_LANKA_TZ).strftime(TIME_FORMAT)
-    st.write(f"📅 Date & Time: {now}")
+    now = datetime.now(SRI_LANKA_TZ)
+    st.write(f"📅 Date & Time: {now.strftime(DISPLAY_TIME_FORMAT)}")
 
-    subtopics_df = df[df['Product'] == selected_product]
-    entry = {"User": logged_user, "Product": selected_product, "DateTime": now}
+    subtopics_df = st.session_state.qual_by_product.get(selected_product, df.iloc[0:0])
+    entry = {"User": logged_user, "Product": selected_product, "DateTime": None}
 
     with st.form(key="qual_entry_form"):
-        for _, row in subtopics_df.iterrows():
-            if str(row["Dropdown or Not"]).strip().lower() == "yes":
-                options = [opt.strip() for opt in str(row["Dropdown Options"]).split(",")]
-                entry[row["Subtopic"]] = st.selectbox(row["Subtopic"], options, key=f"qual_{row['Subtopic']}")
-            else:
-                entry[row["Subtopic"]] = st.text_input(row["Subtopic"], key=f"qual_{row['Subtopic']}")
+        entry.update(subtopic_inputs(subtopics_df, key_prefix="qual_"))
 
         submitted = st.form_submit_button("Save Locally")
         sync_button = st.form_submit_button("💾 Sync Quality Data")
 
     if submitted:
+        # Timestamp the record when it is saved, not on every rerun
+        entry["DateTime"] = now.strftime(TIME_FORMAT)
         save_locally(entry, "qual_local_data")
+
+    with st.expander("📋 Enter several records at once"):
+        batch_data_entry(subtopics_df, logged_user, selected_product, "qual_local_data",
+                         key=f"qual_batch_{selected_product}")
+
     if st.button("Logout"):
         st.session_state.qual_logged_in = False
         st.session_state.qual_logged_user = ""
         st.rerun()
 
     if sync_button:
-        sync_local_data_to_sheet("qual_local_data", "Quality_History")
-        st.rerun()
+        if sync_local_data_to_sheet(SHEET_NAME, "qual_local_data", "Quality_History"):
+            st.rerun()
 
 def downtime_data_entry(logged_user):
     df = st.session_state.downtime_config_df
@@ -250,16 +254,15 @@ def downtime_data_entry(logged_user):
         return
 
     st.subheader("Please Enter the Downtime Data")
-    planned_items = prod_df['Product'].unique().tolist()
+    planned_items = st.session_state.product_list
     selected_item = st.selectbox("Planned Item", planned_items)
-    now = datetime.now(SRI_LANKA_TZ).strftime(TIME_FORMAT)
-    st.write(f"📅 Date & Time: {now}")
+    now = datetime.now(SRI_LANKA_TZ)
+    st.write(f"📅 Date & Time: {now.strftime(DISPLAY_TIME_FORMAT)}")
 
-    entry = {"User": logged_user, "Product": selected_item, "DateTime": now}
+    entry = {"User": logged_user, "Product": selected_item, "DateTime": None}
 
     with st.form(key="downtime_entry_form"):
-        for col in df.columns:
-            options = [str(x).strip() for x in df[col].dropna().unique() if str(x).strip() != ""]
+        for col, options in st.session_state.downtime_options.items():
             if options:
                 entry[col] = st.selectbox(col, options, key=f"downtime_{col}")
             else:
@@ -269,30 +272,53 @@ def downtime_data_entry(logged_user):
         sync_button = st.form_submit_button("💾 Sync Downtime Data")
 
     if submitted:
+        # Timestamp the record when it is saved, not on every rerun
+        entry["DateTime"] = now.strftime(TIME_FORMAT)
         save_locally(entry, "downtime_local_data")
     if st.button("Logout"):
         st.session_state.downtime_logged_in = False
         st.session_state.downtime_logged_user = ""
         st.rerun()
     if sync_button:
-        sync_local_data_to_sheet("downtime_local_data", "Downtime_History")
-        st.rerun()
+        if sync_local_data_to_sheet(SHEET_NAME, "downtime_local_data", "Downtime_History"):
+            st.rerun()
 
     
-# ------------------ LOAD CONFIG SHEETS ------------------
-sheet = get_gsheet_data(SHEET_NAME)
-if sheet:
-    if "production_config_df" not in st.session_state:
-        st.session_state.production_config_df = read_sheet(sheet, PRODUCTION_CONFIG_SHEET)
-    if "quality_config_df" not in st.session_state:
-        st.session_state.quality_config_df = read_sheet(sheet, QUALITY_CONFIG_SHEET)
-    if "downtime_config_df" not in st.session_state:
-        st.session_state.downtime_config_df = read_sheet(sheet, DOWNTIME_CONFIG_SHEET)
-
 # ------------------ MAIN APP LOGIC ------------------
 menu = ["Home", "Production Team", "Quality Team", "Downtime Data"]
 choice = st.sidebar.selectbox("Main Sections", menu)
 
+# Config sheets are cached; let supervisors pick up edits without waiting
+# for the cache to expire
+if st.sidebar.button("🔄 Reload Config Sheets"):
+    clear_configs()
+    for key in ["production_config_df", "quality_config_df", "downtime_config_df",
+                "prod_by_product", "product_list", "qual_by_product", "downtime_options"]:
+        st.session_state.pop(key, None)
+    st.rerun()
+
+# ------------------ LOAD CONFIG SHEETS ------------------
+# Home only shows the sync status, so the config sheets (and the Sheets
+# connection) are loaded the first time an entry page is opened
+if choice != "Home":
+    sheet = get_gsheet_data(SHEET_NAME)
+    if sheet:
+        if "production_config_df" not in st.session_state:
+            configs = load_configs(SHEET_NAME, [PRODUCTION_CONFIG_SHEET, QUALITY_CONFIG_SHEET, DOWNTIME_CONFIG_SHEET])
+            st.session_state.production_config_df = configs[PRODUCTION_CONFIG_SHEET]
+            st.session_state.quality_config_df = configs[QUALITY_CONFIG_SHEET]
+            st.session_state.downtime_config_df = configs[DOWNTIME_CONFIG_SHEET]
+
+        # Group the config rows by product once per session instead of
+        # boolean-filtering the DataFrame on every rerun
+        if "prod_by_product" not in st.session_state:
+            st.session_state.prod_by_product = index_by_product(st.session_state.production_config_df)
+            st.session_state.product_list = list(st.session_state.prod_by_product)
+        if "qual_by_product" not in st.session_state:
+            st.session_state.qual_by_product = index_by_product(st.session_state.quality_config_df)
+        if "downtime_options" not in st.session_state:
+            st.session_state.downtime_options = column_options(st.session_state.downtime_config_df)
+
 # HOME SECTION
 if choice == "Home":
     st.markdown("<h2 style='text-align: center;'>Welcome to Die Casting Production App</h2>", unsafe_allow_html=True)
@@ -330,10 +356,17 @@ elif choice == "Production Team":
         production_data_entry(st.session_state.logged_user)
     else:
         st.header("🔑 Production Team Login")
-        selected_user = st.selectbox("Select Username", list(USER_CREDENTIALS.keys()), key="prod_user")
-        entered_password = st.text_input("Enter Password", type="password", key="prod_pass")
-        if st.button("Login", key="prod_login_btn"):
-            if USER_CREDENTIALS.get(selected_user) == entered_password:
+
+        user_hashes = load_user_hashes()
+
+        # Use a form so typing doesn't rerun the script
+        with st.form(key="prod_login_form"):
+            selected_user = st.selectbox("Select Username", list(user_hashes), key="prod_user")
+            entered_password = st.text_input("Enter Password", type="password", key="prod_pass")
+            login_btn = st.form_submit_button("Login")
+
+        if login_btn:
+            if check_password(entered_password, user_hashes.get(selected_user)):
                 st.session_state.prod_logged_in = True
                 st.session_state.logged_user = selected_user
                 st.success(f"Welcome, {selected_user}!")
@@ -355,7 +388,7 @@ elif choice == "Quality Team":
             login_btn = st.form_submit_button("Login")
         
         if login_btn:
-            if entered_pass == QUALITY_SHARED_PASSWORD:
+            if check_password(entered_pass, QUALITY_SHARED_PASSWORD):
                 st.session_state.qual_logged_in = True
                 st.session_state.qual_logged_user = entered_user
                 st.success(f"Welcome, {entered_user}!")
@@ -369,10 +402,15 @@ elif choice == "Downtime Data":
         downtime_data_entry(st.session_state.downtime_logged_user)
     else:
         st.header("🔑 Downtime Team Login")
-        entered_user = st.text_input("Enter Your Name", key="downtime_user")
-        entered_pass = st.text_input("Enter Password", type="password", key="downtime_pass")
-        if st.button("Login", key="downtime_login_btn"):
-            if entered_pass == DOWNTIME_SHARED_PASSWORD:
+
+        # Use a form so typing doesn't rerun the script
+        with st.form(key="downtime_login_form"):
+            entered_user = st.text_input("Enter Your Name", key="downtime_user")
+            entered_pass = st.text_input("Enter Password", type="password", key="downtime_pass")
+            login_btn = st.form_submit_button("Login")
+
+        if login_btn:
+            if check_password(entered_pass, DOWNTIME_SHARED_PASSWORD):
                 st.session_state.downtime_logged_in = True
                 st.session_state.downtime_logged_user = entered_user
                 st.success(f"Welcome, {entered_user}!")
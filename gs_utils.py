@@ -0,0 +1,289 @@
+# Google Sheets access, the local record buffer and the sync, shared by the
+# app pages. Kept in its own module so Streamlit imports it once per process
+# instead of re-executing it with app.py on every rerun.
+import streamlit as st
+import pandas as pd
+import gspread
+from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from pathlib import Path
+import json
+import threading
+
+# ------------------ GOOGLE SHEET CONNECTION ------------------
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _authorize_gs_client():
+    scopes = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive",
+    ]
+    # Read the secrets section once rather than per key
+    sa = st.secrets["gcp_service_account"]
+    creds_dict = {
+        "type": sa["type"],
+        "project_id": sa["project_id"],
+        "private_key_id": sa["private_key_id"],
+        "private_key": sa["private_key"].replace('\\n', '\n'),
+        "client_email": sa["client_email"],
+        "client_id": sa["client_id"],
+        "auth_uri": sa["auth_uri"],
+        "token_uri": sa["token_uri"],
+        "auth_provider_x509_cert_url": sa["auth_provider_x509_cert_url"],
+        "client_x509_cert_url": sa["client_x509_cert_url"]
+    }
+    creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+    # Every session shares this client, so give it a larger connection pool
+    # and let urllib3 retry transient errors on idempotent (non-POST) calls
+    session = AuthorizedSession(creds)
+    session.mount("https://", HTTPAdapter(pool_maxsize=32, max_retries=Retry(
+        total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)))
+    return gspread.Client(None, session=session)
+
+# Failures raise out of the cached helpers, so they are never cached and the
+# next rerun retries the connection.
+def get_gs_client():
+    try:
+        if 'gcp_service_account' not in st.secrets:
+            st.error("Google Service Account credentials not found in secrets.")
+            return None
+        return _authorize_gs_client()
+    except Exception as e:
+        st.error(f"Failed to authenticate with Google Sheets: {str(e)}")
+        return None
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _open_spreadsheet(sheet_name):
+    return _authorize_gs_client().open(sheet_name)
+
+def get_gsheet_data(sheet_name):
+    client = get_gs_client()
+    if client:
+        return _open_spreadsheet(sheet_name)
+    else:
+        return None
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_worksheet(sheet_name, ws_name):
+    return _open_spreadsheet(sheet_name).worksheet(ws_name)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_headers(sheet_name, ws_name):
+    return get_worksheet(sheet_name, ws_name).row_values(1)
+
+def values_to_df(values):
+    # First row is the header; pad/trim ragged rows the way get_all_records does
+    if not values:
+        return pd.DataFrame()
+    header = values[0]
+    width = len(header)
+    rows = [(row + [""] * width)[:width] for row in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_configs(sheet_name, worksheet_names):
+    # One values:batchGet request for every config worksheet
+    response = _open_spreadsheet(sheet_name).values_batch_get([f"'{name}'" for name in worksheet_names])
+    return {name: parse_dropdown_columns(values_to_df(value_range.get("values", [])))
+            for name, value_range in zip(worksheet_names, response["valueRanges"])}
+
+def parse_dropdown_columns(df):
+    # Split "Dropdown Options" and normalise "Dropdown or Not" once per load
+    # so the entry forms don't redo the string work on every rerun
+    if "Dropdown Options" in df.columns:
+        df["_opts"] = df["Dropdown Options"].fillna("").astype(str).str.split(",").apply(
+            lambda xs: [x.strip() for x in xs if x.strip()])
+    if "Dropdown or Not" in df.columns:
+        df["_is_dd"] = df["Dropdown or Not"].astype(str).str.strip().str.lower().eq("yes")
+    return df
+
+def clear_configs():
+    _fetch_configs.clear()
+
+def load_configs(sheet_name, worksheet_names):
+    try:
+        return _fetch_configs(sheet_name, tuple(worksheet_names))
+    except Exception as e:
+        st.error(f"Error reading config worksheets: {str(e)}")
+        return {name: pd.DataFrame() for name in worksheet_names}
+
+def index_by_product(df):
+    if df.empty or "Product" not in df.columns:
+        return {}
+    return {product: group for product, group in df.groupby("Product", sort=False)}
+
+def column_options(df):
+    return {col: [s for s in (str(x).strip() for x in df[col].dropna().unique()) if s]
+            for col in df.columns}
+
+# ------------------ LOCAL SAVE ------------------
+# Next to this module by default, so the queues don't move with the working
+# directory; set buffer_dir in secrets to keep them elsewhere
+DEFAULT_BUFFER_DIR = Path(__file__).resolve().parent / "local_buffer"
+
+# Unsynced records live in one JSONL file per queue, so they survive server
+# restarts and expired sessions until they are synced
+@st.cache_resource(show_spinner=False)
+def _buffer_lock():
+    # One lock for every session in the server process
+    return threading.Lock()
+
+def _buffer_dir():
+    try:
+        return Path(st.secrets.get("buffer_dir", DEFAULT_BUFFER_DIR))
+    except FileNotFoundError:
+        return DEFAULT_BUFFER_DIR
+
+def _buffer_path(storage_key):
+    return _buffer_dir() / f"{storage_key}.jsonl"
+
+def _replace_lines(path, lines):
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text("".join(lines), encoding="utf-8")
+    tmp_path.replace(path)
+
+def read_local_data(storage_key):
+    path = _buffer_path(storage_key)
+    with _buffer_lock():
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+        records, good_lines, bad_lines = [], [], []
+        for line in lines:
+            line = line if line.endswith("\n") else line + "\n"
+            try:
+                records.append(json.loads(line))
+                good_lines.append(line)
+            except ValueError:
+                bad_lines.append(line)
+        if bad_lines:
+            # A write cut short (crash, full disk) leaves a line that won't
+            # decode; move it aside so the queue stays usable and its lines
+            # keep matching the records drop_local_data counts
+            corrupt_path = path.with_suffix(".corrupt")
+            with corrupt_path.open("a", encoding="utf-8") as f:
+                f.writelines(bad_lines)
+            _replace_lines(path, good_lines)
+            st.warning(f"{len(bad_lines)} unreadable line(s) in {path.name} were moved to {corrupt_path}.")
+        return records
+
+def append_local_data(storage_key, records):
+    path = _buffer_path(storage_key)
+    lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+    with _buffer_lock():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a+b") as f:
+            # Start on a new line if the previous write was cut off mid-line
+            if f.tell() > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    lines = "\n" + lines
+            f.write(lines.encode("utf-8"))
+
+def drop_local_data(storage_key, count):
+    # Remove the first `count` records once they are in the sheet; anything
+    # saved meanwhile was appended after them and is kept
+    path = _buffer_path(storage_key)
+    with _buffer_lock():
+        with path.open(encoding="utf-8", errors="replace") as f:
+            remaining = f.readlines()[count:]
+        _replace_lines(path, remaining)
+
+def save_locally(data, storage_key):
+    append_local_data(storage_key, [data])
+    st.success("Data saved locally!")
+
+# ------------------ SYNC FUNCTION ------------------
+# Rows per values.append request, keeps large backlogs under the payload limit
+APPEND_CHUNK_ROWS = 5000
+
+def _is_rate_limited(exc):
+    return isinstance(exc, gspread.exceptions.APIError) and exc.response.status_code == 429
+
+# Back off on "Write requests per minute" quota errors; anything else fails fast
+@retry(retry=retry_if_exception(_is_rate_limited), wait=wait_exponential(multiplier=1, max=30),
+       stop=stop_after_attempt(5), reraise=True)
+def append_rows_with_retry(ws, rows):
+    ws.append_rows(rows, value_input_option="USER_ENTERED")
+
+@st.cache_resource(show_spinner=False)
+def _sync_lock(local_key):
+    return threading.Lock()
+
+def sync_local_data_to_sheet(sheet_name, local_key, history_sheet_name):
+    # Returns True only when every buffered record reached the sheet, so the
+    # caller can skip its rerun and keep any warning or error on screen.
+    # One sync per queue at a time; a second click (another tab or user)
+    # would otherwise append the same buffered records twice
+    lock = _sync_lock(local_key)
+    if not lock.acquire(blocking=False):
+        st.warning(f"{history_sheet_name} is already being synced, please try again shortly.")
+        return False
+    try:
+        return _sync_local_data(sheet_name, local_key, history_sheet_name)
+    finally:
+        lock.release()
+
+def _sync_local_data(sheet_name, local_key, history_sheet_name):
+    local_data = read_local_data(local_key)
+    if not local_data:
+        st.warning("No local data to sync!")
+        return False
+    client = get_gs_client()
+    if not client:
+        st.error("Cannot connect to Google Sheets!")
+        return False
+
+    try:
+        ws = get_worksheet(sheet_name, history_sheet_name)
+    except gspread.exceptions.WorksheetNotFound:
+        st.error(f"Worksheet '{history_sheet_name}' not found!")
+        return False
+
+    # Get existing headers (cached between syncs); only go back to the sheet
+    # when a record has a column the cached header doesn't know about
+    existing_cols = get_headers(sheet_name, history_sheet_name)
+    if any(k not in existing_cols for entry in local_data for k in entry):
+        get_headers.clear()
+        existing_cols = get_headers(sheet_name, history_sheet_name)
+    
+    # Ensure User, Product, DateTime are first
+    mandatory_cols = ["User", "Product", "DateTime"]
+    other_existing_cols = [col for col in existing_cols if col not in mandatory_cols]
+    
+    # Collect new columns from local data, in first-seen order so the
+    # header stays stable between syncs
+    existing_set = set(mandatory_cols) | set(other_existing_cols)
+    new_cols = list(dict.fromkeys(k for entry in local_data
+                                  for k in entry if k not in existing_set))
+    
+    # Final column order
+    final_cols = mandatory_cols + other_existing_cols + new_cols
+    
+    # Update header row only if columns changed
+    if final_cols != existing_cols:
+        ws.update(range_name='1:1', values=[final_cols])
+        get_headers.clear()
+    
+    # Prepare rows to append
+    rows_to_append = []
+    for entry in local_data:
+        row = [entry.get(col, "") for col in final_cols]
+        rows_to_append.append(row)
+
+    # Each chunk is one values.append call; synced rows leave local storage
+    # right away so a later failure never re-sends them
+    for start in range(0, len(rows_to_append), APPEND_CHUNK_ROWS):
+        chunk = rows_to_append[start:start + APPEND_CHUNK_ROWS]
+        try:
+            append_rows_with_retry(ws, chunk)
+        except gspread.exceptions.APIError as e:
+            st.error(f"Failed to sync {history_sheet_name}, {len(rows_to_append) - start} records kept locally: {str(e)}")
+            return False
+        drop_local_data(local_key, len(chunk))
+
+    st.success(f"✅ {len(rows_to_append)} records synced to {history_sheet_name}!")
+    return True